@@ -2,13 +2,385 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import aiohttp
+import orjson
+from yarl import URL
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_ID, CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN
+from .const import (
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    MIN_SCAN_INTERVAL,
+    URL_GET_DATA,
+    URL_GET_TOKEN,
+    URL_LOGIN,
+    URL_SET_DATA,
+)
+
+_LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["climate", "sensor", "binary_sensor"]
 
+TOKEN_LIFETIME = 3600
+TOKEN_STORAGE_VERSION = 1
+
+STATS_STORAGE_VERSION = 1
+# Seconds to coalesce heating-total changes into one write of .storage
+STATS_SAVE_DELAY = 5
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+RETRY_STATUSES = (500, 502, 503, 504)
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.3
+
+# Cookies are kept for the whole site so set.php (outside /public) gets them too
+SALUS_ORIGIN = URL(URL_LOGIN).origin()
+
+# Requests in flight to salus-it500.com across all entries
+_HOST_SEM = asyncio.Semaphore(2)
+
+# The token shows up in control.php as a hidden input or in inline script;
+# one compiled alternation finds whichever form is present in a single scan.
+_TOKEN_RE = re.compile(
+    r"""id=["']token["'][^>]*value=["'](?P<a>[^"']+)["']"""
+    r"""|name=["']token["'][^>]*value=["'](?P<b>[^"']+)["']"""
+    r"|token'\s*:\s*'(?P<c>[^']+)'"
+    r'|"token"\s*:\s*"(?P<d>[^"]+)"'
+    r"""|token\s*=\s*['"](?P<e>[^'"]+)['"]""",
+    re.IGNORECASE,
+)
+TOKEN_CHUNK_SIZE = 4096
+# Tail of the previous chunk kept so a token split across chunks still matches
+TOKEN_SCAN_OVERLAP = 1024
+
+
+class SalusCoordinator(DataUpdateCoordinator):
+    """Poll salus-it500.com once per interval and share the values with all entities."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        username,
+        password,
+        device_id,
+        update_interval: timedelta,
+        store: Store,
+        stored_token,
+        stats_store: Store,
+        stats,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
+        self._username = username
+        self._password = password
+        self._id = device_id
+        self._token = None
+        self._token_timestamp = None
+        self._token_restored = False
+        self._token_lock = asyncio.Lock()
+        self._store = store
+        self._stats_store = stats_store
+        # Heating totals of the statistics sensors, keyed by unique_id
+        self.stats = stats or {}
+        self._last_etag = None
+        self._last_modified = None
+
+        # Own cookie jar for the Salus login, pooled connector shared with HA
+        self._session = async_create_clientsession(hass)
+
+        # Reuse a token from before the restart while it is still valid; it is
+        # only accepted together with the session cookies it was issued with
+        if (
+            stored_token
+            and stored_token.get("device_id") == device_id
+            and time.time() - stored_token.get("ts", 0) < TOKEN_LIFETIME
+        ):
+            self._token = stored_token.get("token")
+            self._token_timestamp = stored_token["ts"]
+            self._token_restored = True
+            self._session.cookie_jar.update_cookies(
+                stored_token.get("cookies") or {}, SALUS_ORIGIN
+            )
+
+    async def async_shutdown(self) -> None:
+        """Stop polling, flush the heating totals and release the Salus session."""
+        await super().async_shutdown()
+        # cancels a pending delayed save, so a reload or removal can't race it
+        await self._stats_store.async_save(self.stats)
+        await self._session.close()
+
+    @callback
+    def async_save_stats(self) -> None:
+        """Schedule a debounced write of the heating totals."""
+        self._stats_store.async_delay_save(lambda: self.stats, STATS_SAVE_DELAY)
+
+    async def _async_update_data(self) -> dict:
+        """Fetch the latest values from Salus."""
+        return await self._get_data()
+
+    async def async_set_temperature(self, temperature) -> None:
+        """Set new target temperature, via URL commands."""
+        payload = {
+            "token": self._token,
+            "devId": self._id,
+            "tempUnit": "0",
+            "current_tempZ1_set": "1",
+            "current_tempZ1": temperature,
+        }
+        if await self._set_data(payload):
+            self.data["target_temperature"] = temperature
+            self.data["is_heating"] = _is_heating(
+                self.data["current_temperature"], _to_float(temperature)
+            )
+            self.async_update_listeners()
+
+    async def async_set_operation_mode(self, operation_mode) -> None:
+        """Switch between manual ("ON") and auto ("OFF") operation."""
+        auto = "1" if operation_mode == "OFF" else "0"
+        payload = {"token": self._token, "devId": self._id, "auto": auto, "auto_setZ1": "1"}
+        if await self._set_data(payload):
+            self.data["operation_mode"] = operation_mode
+            self.async_update_listeners()
+
+    @asynccontextmanager
+    async def _request(self, method, url, **kwargs):
+        """Send a request on the pooled session, retrying transient 5xx replies."""
+        async with _HOST_SEM:
+            for attempt in range(RETRY_ATTEMPTS + 1):
+                resp = await self._session.request(
+                    method, url, timeout=REQUEST_TIMEOUT, **kwargs
+                )
+                if resp.status not in RETRY_STATUSES or attempt == RETRY_ATTEMPTS:
+                    break
+                resp.release()
+                await asyncio.sleep(RETRY_BACKOFF * 2**attempt)
+            async with resp:
+                yield resp
+
+    async def _set_data(self, payload) -> bool:
+        """Post a control payload to Salus, returning True on success."""
+        headers = {"content-type": "application/x-www-form-urlencoded"}
+        try:
+            async with self._request(
+                "post", URL_SET_DATA, data=payload, headers=headers
+            ) as resp:
+                return resp.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.error("Could not send data to Salus: %s", err)
+            return False
+
+    def _token_valid(self) -> bool:
+        """Return True while the current token is younger than an hour."""
+        return (
+            self._token is not None
+            and int(time.time()) - (self._token_timestamp or 0) <= TOKEN_LIFETIME
+        )
+
+    async def get_token(self) -> None:
+        """Get the Session Token of the Thermostat."""
+        async with self._token_lock:
+            # another caller may have logged in while we waited
+            if self._token_valid():
+                return
+            await self._login()
+
+    async def _login(self) -> None:
+        """Log in and scrape a fresh token from the control page."""
+        payload = {
+            "IDemail": self._username,
+            "password": self._password,
+            "login": "Login"
+        }
+        headers = {"content-type": "application/x-www-form-urlencoded"}
+        try:
+            # The session cookie comes with the login reply itself; following
+            # its redirect would only fetch a page we never look at.
+            async with self._request(
+                "post", URL_LOGIN, data=payload, headers=headers, allow_redirects=False
+            ) as resp:
+                await resp.read()
+
+            params = {"devId": self._id}
+            async with self._request("get", URL_GET_TOKEN, params=params) as resp:
+                if resp.status != 200:
+                    return
+                token = await _async_find_token(resp)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.error("Could not log in to Salus: %s", err)
+            return
+
+        if token:
+            self._token = token
+            self._token_timestamp = int(time.time())
+            self._token_restored = False
+            _LOGGER.info("Got new token. Timestamp: %s", self._token_timestamp)
+            cookies = self._session.cookie_jar.filter_cookies(SALUS_ORIGIN)
+            self.hass.async_create_task(
+                self._store.async_save(
+                    {
+                        "token": token,
+                        "ts": self._token_timestamp,
+                        "device_id": self._id,
+                        "cookies": {name: morsel.value for name, morsel in cookies.items()},
+                    }
+                )
+            )
+
+    def _drop_restored_token(self) -> None:
+        """Forget a token restored from storage once Salus stops accepting it."""
+        if self._token_restored:
+            self._token = None
+            self._token_restored = False
+
+    async def _get_data(self) -> dict:
+        """Retrieve data from the device."""
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Starting _get_data. Timestamp: %s", int(time.time()))
+
+        # if no token or token older than 1h, re-login
+        if not self._token_valid():
+            _LOGGER.debug("No token or token expired, calling get_token().")
+            await self.get_token()
+
+        if not self._token:
+            raise UpdateFailed("Could not get a valid token from Salus.")
+
+        restored = self._token_restored
+        try:
+            data = await self._fetch_data()
+        except UpdateFailed:
+            # _fetch_data drops a token from storage that Salus rejected;
+            # log in once rather than failing the refresh (and setup)
+            if not restored or self._token is not None:
+                raise
+            _LOGGER.debug("Restored token was rejected, logging in again.")
+            await self.get_token()
+            if not self._token:
+                raise
+            data = await self._fetch_data()
+        if data is None:
+            return self.data
+
+        target_temperature = _to_float(data.get("CH1currentSetPoint"))
+        current_temperature = _to_float(data.get("CH1currentRoomTemp"))
+        status = _to_int(data.get("CH1heatOnOffStatus"), 0)
+        mode = _to_int(data.get("CH1heatOnOff"), 1)
+
+        return {
+            "target_temperature": target_temperature,
+            "current_temperature": current_temperature,
+            "frost": _to_float(data.get("frost")),
+            # On/Off status
+            "status": "ON" if status == 1 else "OFF",
+            # Manual/Auto mode
+            "operation_mode": "OFF" if mode == 1 else "ON",
+            "is_heating": _is_heating(current_temperature, target_temperature),
+        }
+
+    async def _fetch_data(self) -> dict | None:
+        """GET the device values with the current token; None if unchanged (304)."""
+        params = {
+            "devId": self._id,
+            "token": self._token,
+            "&_": str(int(round(time.time() * 1000))),
+        }
+        # Let the server answer 304 when nothing changed since the last poll
+        headers = {}
+        if self.data is not None:
+            if self._last_etag:
+                headers["If-None-Match"] = self._last_etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        try:
+            async with self._request(
+                "get", URL_GET_DATA, params=params, headers=headers
+            ) as resp:
+                if resp.status == 304:
+                    return None
+                if resp.status != 200:
+                    self._drop_restored_token()
+                    raise UpdateFailed(
+                        f"Could not get data from Salus (status_code={resp.status})."
+                    )
+                try:
+                    data = orjson.loads(await resp.read())
+                except orjson.JSONDecodeError as err:
+                    self._drop_restored_token()
+                    raise UpdateFailed("Invalid JSON returned from Salus.") from err
+                self._last_etag = resp.headers.get("ETag")
+                self._last_modified = resp.headers.get("Last-Modified")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise UpdateFailed(f"Could not get data from Salus: {err}") from err
+        return data
+
+
+async def _async_find_token(resp: aiohttp.ClientResponse) -> str | None:
+    """Scan the control.php body as it streams in, stopping at the token."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    buf = ""
+    async for chunk in resp.content.iter_chunked(TOKEN_CHUNK_SIZE):
+        buf = buf[-TOKEN_SCAN_OVERLAP:] + decoder.decode(chunk)
+        match = _TOKEN_RE.search(buf)
+        if match:
+            return next((group for group in match.groups() if group), None)
+    return None
+
+
+def _to_int(value, default: int) -> int:
+    """Return a Salus 0/1 flag as an int, whether sent as a string or a number."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_float(value):
+    """Return value as a float, or None if Salus sent nothing usable."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_heating(current_temperature, target_temperature):
+    """Return True while the room is below target, None if either is unknown."""
+    if current_temperature is None or target_temperature is None:
+        return None
+    return current_temperature < target_temperature
+
+
+def _token_storage_key(entry: ConfigEntry) -> str:
+    """Return the storage key holding the cached Salus token for an entry."""
+    return f"{DOMAIN}_{entry.entry_id}_token"
+
+
+def _stats_storage_key(entry: ConfigEntry) -> str:
+    """Return the storage key holding the heating totals for an entry."""
+    return f"{DOMAIN}_{entry.entry_id}_stats"
+
+
+def _scan_interval(config_data: dict) -> timedelta:
+    """Return the configured poll interval, never below MIN_SCAN_INTERVAL."""
+    try:
+        seconds = int(config_data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+    except (TypeError, ValueError):
+        seconds = DEFAULT_SCAN_INTERVAL
+    return timedelta(seconds=max(MIN_SCAN_INTERVAL, seconds))
+
 
 def _merged_entry_config(entry: ConfigEntry) -> dict:
     """Return config with options overriding data."""
@@ -17,15 +389,31 @@ def _merged_entry_config(entry: ConfigEntry) -> dict:
 
 async def _async_entry_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options updates by reloading the entry."""
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = _merged_entry_config(entry)
+    # async_setup_entry rebuilds the merged config (and coordinator) on reload
     await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Salus integration from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = _merged_entry_config(entry)
+    config_data = _merged_entry_config(entry)
+
+    store = Store(hass, TOKEN_STORAGE_VERSION, _token_storage_key(entry))
+    stats_store = Store(hass, STATS_STORAGE_VERSION, _stats_storage_key(entry))
+    coordinator = SalusCoordinator(
+        hass,
+        config_data.get(CONF_USERNAME),
+        config_data.get(CONF_PASSWORD),
+        config_data.get(CONF_ID),
+        _scan_interval(config_data),
+        store,
+        await store.async_load(),
+        stats_store,
+        await stats_store.async_load(),
+    )
+    await coordinator.async_config_entry_first_refresh()
+
+    hass.data[DOMAIN][entry.entry_id] = {**config_data, "coordinator": coordinator}
 
     entry.async_on_unload(entry.add_update_listener(_async_entry_updated))
 
@@ -37,5 +425,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        config_data = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        if config_data and "coordinator" in config_data:
+            await config_data["coordinator"].async_shutdown()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached token and heating totals when the entry is deleted."""
+    await Store(hass, TOKEN_STORAGE_VERSION, _token_storage_key(entry)).async_remove()
+    await Store(hass, STATS_STORAGE_VERSION, _stats_storage_key(entry)).async_remove()
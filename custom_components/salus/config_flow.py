@@ -2,10 +2,11 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import callback
-from homeassistant.const import CONF_USERNAME, CONF_PASSWORD, CONF_ID
+from homeassistant.const import CONF_USERNAME, CONF_PASSWORD, CONF_ID, CONF_SCAN_INTERVAL
 import homeassistant.helpers.config_validation as cv
 
 from . import DOMAIN
+from .const import DEFAULT_SCAN_INTERVAL, MAX_SCAN_INTERVAL, MIN_SCAN_INTERVAL
 
 
 class SalusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -69,6 +70,12 @@ class SalusOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Required(CONF_USERNAME, default=current.get(CONF_USERNAME, "")): cv.string,
                 vol.Required(CONF_PASSWORD, default=current.get(CONF_PASSWORD, "")): cv.string,
                 vol.Required(CONF_ID, default=current.get(CONF_ID, "")): cv.string,
+                vol.Required(
+                    CONF_SCAN_INTERVAL,
+                    default=current.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                ): vol.All(
+                    vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL)
+                ),
             }
         )
 
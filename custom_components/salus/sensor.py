@@ -1,13 +1,16 @@
-import logging
 import datetime
-from datetime import timedelta
+import time
+from dataclasses import dataclass
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.entity import EntityCategory
 from homeassistant.components.sensor import SensorEntity
-from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.restore_state import async_get as async_get_restore_state
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+from homeassistant.components.climate.const import HVACAction
 from homeassistant.const import (
     STATE_UNAVAILABLE, 
     STATE_UNKNOWN
@@ -15,10 +18,6 @@ from homeassistant.const import (
 
 from . import DOMAIN
 
-# Decrease poll interval to 15 seconds:
-SCAN_INTERVAL = timedelta(seconds=15)
-
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -31,20 +30,23 @@ async def async_setup_entry(
     """
     # We assume your climate entity is called climate.salus_thermostat
     climate_entity_id = "climate.salus_thermostat"
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    heater_history = StatisticaCentralaSensor(coordinator, climate_entity_id)
 
     sensors = [
-        StareTermostatSensor(climate_entity_id),
-        StatisticaCentralaSensor(climate_entity_id),
-        StatisticaCentralaIeriSensor(climate_entity_id),
-        StatisticaCentralaLunaCurentaSensor(climate_entity_id),
-        StatisticaCentralaLunaTrecutaSensor(climate_entity_id),
-        DurataIncalzireSensor("sensor.thermostat_state"),  # references the sensor above
-        SalusCurrentTempSensor(climate_entity_id)          # <-- Your new temperature sensor
+        StareTermostatSensor(coordinator, climate_entity_id),
+        heater_history,
+        StatisticaCentralaIeriSensor(coordinator, climate_entity_id),
+        StatisticaCentralaLunaCurentaSensor(coordinator, climate_entity_id),
+        StatisticaCentralaLunaTrecutaSensor(coordinator, climate_entity_id),
+        DurataIncalzireSensor(heater_history, "sensor.thermostat_state"),
+        SalusCurrentTempSensor(coordinator, climate_entity_id)  # <-- Your new temperature sensor
     ]
-    async_add_entities(sensors, update_before_add=True)
+    # the coordinator was refreshed once in async_setup_entry; no per-entity update
+    async_add_entities(sensors)
 
 
-class StareTermostatSensor(SensorEntity):
+class StareTermostatSensor(CoordinatorEntity, SensorEntity):
     """
     Replaces:
       template:
@@ -52,26 +54,208 @@ class StareTermostatSensor(SensorEntity):
             - name: "stare termostat"
               state: "{{ state_attr('climate.salus_thermostat','hvac_action') }}"
     """
-    def __init__(self, climate_entity_id):
-        self._climate_entity_id = climate_entity_id
+    def __init__(self, coordinator, climate_entity_id):
+        super().__init__(coordinator)
         self._attr_name = "Thermostat State"
         self._attr_unique_id = f"{climate_entity_id}_thermostat_state"
-        self._state = STATE_UNKNOWN
 
     @property
     def state(self):
-        return self._state
+        # mirror hvac_action
+        if self.coordinator.data["is_heating"]:
+            return HVACAction.HEATING
+        return HVACAction.IDLE
+
+
+def _restored_seconds(hours):
+    """Return restored hours as seconds; 0 if the state was unknown/unavailable."""
+    if hours in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+        return 0.0
+    try:
+        return float(hours) * 3600.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass(slots=True)
+class HeatAccum:
+    """Heating time of the current period and of the one before it."""
+
+    last_mono: float
+    last_state: str
+    seconds: float = 0.0
+    previous_seconds: float = 0.0
+
+    @property
+    def hours(self):
+        """Current period in hours, as displayed."""
+        return round(self.seconds / 3600.0, 2)
+
+    @property
+    def previous_hours(self):
+        """Previous period in hours, as displayed."""
+        return round(self.previous_seconds / 3600.0, 2)
+
+    def tick(self, hvac_action, now_mono):
+        """Add the time since the last tick if we were heating."""
+        if self.last_state == "heating":
+            self.seconds += now_mono - self.last_mono
+        self.last_mono = now_mono
+        self.last_state = hvac_action
+
+    def rollover(self):
+        """Close the current period."""
+        self.previous_seconds = self.seconds
+        self.seconds = 0.0
+
+
+class _HeatingStatsSensor(CoordinatorEntity, SensorEntity):
+    """
+    Base for the history_stats-style sensors.
+
+    Every Salus fetch is pushed to us by the coordinator; the time since the
+    previous fetch is added while heating, and the totals roll over from a
+    midnight callback once the period (day or month) has changed. The
+    totals are kept in the coordinator's stats store, not in restore_state.
+    """
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._last_update = dt_util.now()
+        self._acc = HeatAccum(last_mono=time.monotonic(), last_state=STATE_UNKNOWN)
+        self._current_period = self._period(self._last_update)
+        self._last_written = None
+
+    async def async_added_to_hass(self):
+        """Load the saved totals on startup and subscribe to midnight."""
+        await super().async_added_to_hass()
+        saved = self.coordinator.stats.get(self.unique_id)
+        if saved:
+            try:
+                self._acc.seconds = float(saved["seconds"])
+                self._acc.previous_seconds = float(saved["previous_seconds"])
+                self._last_update = dt_util.as_local(
+                    dt_util.utc_from_timestamp(float(saved["last_update_ts"]))
+                )
+            except (KeyError, TypeError, ValueError, OverflowError, OSError):
+                pass  # keep "now"; the totals are then taken as today's
+        else:
+            self._migrate_restore_state()
+
+        # restored from a previous period
+        self._current_period = self._period(dt_util.now())
+        if self._period(self._last_update) != self._current_period:
+            self._acc.rollover()
+            # the totals now belong to this period; don't roll them twice
+            self._last_update = dt_util.now()
+        self._acc.last_state = self._hvac_action()
+        if not saved:
+            self._async_save()
+
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._midnight_rollover, hour=0, minute=0, second=0
+            )
+        )
+
+    def _migrate_restore_state(self):
+        """Seed the totals once from the restore_state of older releases."""
+        stored = async_get_restore_state(self.hass).last_states.get(self.entity_id)
+        if stored is None:
+            return
+        last_state = stored.state
+        self._restore(last_state)
+        attributes = last_state.attributes
+        try:
+            if "last_update_ts" in attributes:
+                self._last_update = dt_util.as_local(
+                    dt_util.utc_from_timestamp(float(attributes["last_update_ts"]))
+                )
+            elif "last_update" in attributes:
+                # saved before last_update_ts replaced it
+                self._last_update = datetime.datetime.fromisoformat(
+                    attributes["last_update"]
+                )
+        except (TypeError, ValueError, OverflowError, OSError):
+            pass  # keep "now"; the totals are then taken as today's
+
+    @property
+    def available(self):
+        # the totals are ours; they stay valid while Salus is unreachable
+        return True
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            # minute resolution keeps the attribute stable across ticks
+            "last_update_ts": int(self._last_update.timestamp()) // 60 * 60,
+            "last_state": self._acc.last_state,
+        }
 
-    def update(self):
-        climate_state = self.hass.states.get(self._climate_entity_id)
-        if not climate_state:
-            self._state = STATE_UNAVAILABLE
+    def _hvac_action(self):
+        """Return hvac_action as the climate entity reports it."""
+        if not self.coordinator.last_update_success:
+            return STATE_UNAVAILABLE
+        if self.coordinator.data["is_heating"]:
+            return HVACAction.HEATING
+        return HVACAction.IDLE
+
+    @callback
+    def _handle_coordinator_update(self):
+        self._acc.tick(self._hvac_action(), time.monotonic())
+        self._last_update = dt_util.now()
+
+        # only write when a displayed total or the hvac_action changed
+        written = (
+            self._acc.hours,
+            self._acc.previous_hours,
+            self._acc.last_state,
+        )
+        if written == self._last_written:
             return
-        # mirror hvac_action
-        self._state = climate_state.attributes.get("hvac_action", STATE_UNKNOWN)
+        self._last_written = written
+        self._async_save()
+        self.async_write_ha_state()
+
+    @callback
+    def _midnight_rollover(self, now):
+        self._acc.tick(self._acc.last_state, time.monotonic())
+        period = self._period(now)
+        if period != self._current_period:
+            self._acc.rollover()
+            self._current_period = period
+        self._last_update = now
+        self._async_save()
+        self.async_write_ha_state()
+
+    def _async_save(self):
+        """Hand the raw totals to the coordinator's debounced store."""
+        self.coordinator.stats[self.unique_id] = {
+            "seconds": self._acc.seconds,
+            "previous_seconds": self._acc.previous_seconds,
+            "last_update_ts": self._last_update.timestamp(),
+        }
+        self.coordinator.async_save_stats()
 
+    @staticmethod
+    def _period(moment):
+        """Return the key of the period the totals are reset on."""
+        return moment.date()
 
-class StatisticaCentralaSensor(SensorEntity, RestoreEntity):
+    def _restore(self, last_state):
+        raise NotImplementedError
+
+
+class _MonthlyHeatingStatsSensor(_HeatingStatsSensor):
+    """Base for the sensors that roll over at the start of each month."""
+
+    @staticmethod
+    def _period(moment):
+        # (year, month) so the same month of another year does not match
+        return moment.year, moment.month
+
+
+class StatisticaCentralaSensor(_HeatingStatsSensor):
     """
     Replaces:
       - platform: history_stats
@@ -82,240 +266,100 @@ class StatisticaCentralaSensor(SensorEntity, RestoreEntity):
         start: midnight
         end: now
 
-    Accumulates heating time in memory from midnight to current.
-    Resets daily at midnight. Loses info on HA restart.
+    Accumulates heating time from midnight to current.
+    Resets daily at midnight.
     """
-    def __init__(self, climate_entity_id):
-        self._climate_entity_id = climate_entity_id
+    def __init__(self, coordinator, climate_entity_id):
+        super().__init__(coordinator)
         self._attr_name = "Heater History"
         self._attr_unique_id = f"{climate_entity_id}_.heater_history"
-        self._hours_heating = 0.0
-        self._last_update = datetime.datetime.now()
-        self._last_state = STATE_UNKNOWN
+        self._mirrors = []
 
-    async def async_added_to_hass(self):
-        """Restore state on startup."""
-        await super().async_added_to_hass()
-        last_state = await self.async_get_last_state()
-        if last_state:
-            self._hours_heating = float(last_state.state)
-            attributes = last_state.attributes
-            if "last_update" in attributes:
-                self._last_update = datetime.datetime.fromisoformat(attributes["last_update"])
-            if "last_state" in attributes:
-                self._last_state = attributes["last_state"]
+    @callback
+    def async_write_ha_state(self):
+        super().async_write_ha_state()
+        for mirror in self._mirrors:
+            mirror.async_write_ha_state()
 
-    @property
-    def state(self):
-        return round(self._hours_heating, 2)
+    def _restore(self, last_state):
+        self._acc.seconds = _restored_seconds(last_state.state)
 
     @property
-    def extra_state_attributes(self):
-        return {
-            "last_update": self._last_update.isoformat(),
-            "last_state": self._last_state,
-        }
-
-    def update(self):
-        now = datetime.datetime.now()
-        climate_state = self.hass.states.get(self._climate_entity_id)
-        if climate_state:
-            hvac_action = climate_state.attributes.get("hvac_action", STATE_UNKNOWN)
-        else:
-            hvac_action = STATE_UNAVAILABLE
-
-        # reset if day changed
-        if now.date() != self._last_update.date():
-            self._hours_heating = 0.0
-
-        # accumulate if last state was "heating"
-        time_diff = (now - self._last_update).total_seconds() / 3600.0
-        if self._last_state == "heating":
-            self._hours_heating += time_diff
-
-        self._last_state = hvac_action
-        self._last_update = now
+    def state(self):
+        return self._acc.hours
 
 
-class StatisticaCentralaIeriSensor(SensorEntity, RestoreEntity):
+class StatisticaCentralaIeriSensor(_HeatingStatsSensor):
     """
     Tracks yesterday's heating time.
     Resets at midnight, storing the previous day's total.
     """
-    def __init__(self, climate_entity_id):
-        self._climate_entity_id = climate_entity_id
+    def __init__(self, coordinator, climate_entity_id):
+        super().__init__(coordinator)
         self._attr_name = "Yesterday Heater History"
         self._attr_unique_id = f"{climate_entity_id}_yesterday_heater_history"
-        self._state = 0.0  # yesterday's total
-        self._today_heating = 0.0
-        self._last_update = datetime.datetime.now()
-        self._last_state = STATE_UNKNOWN
 
-    async def async_added_to_hass(self):
-        """Restore state on startup."""
-        await super().async_added_to_hass()
-        last_state = await self.async_get_last_state()
-        if last_state:
-            self._state = float(last_state.state)
-            attributes = last_state.attributes
-            if "today_heating" in attributes:
-                self._today_heating = float(attributes["today_heating"])
-            if "last_update" in attributes:
-                self._last_update = datetime.datetime.fromisoformat(attributes["last_update"])
-            if "last_state" in attributes:
-                self._last_state = attributes["last_state"]
+    def _restore(self, last_state):
+        self._acc.previous_seconds = _restored_seconds(last_state.state)
+        if "today_heating" in last_state.attributes:
+            self._acc.seconds = _restored_seconds(last_state.attributes["today_heating"])
 
     @property
     def state(self):
-        return round(self._state, 2)
+        return self._acc.previous_hours
 
     @property
     def extra_state_attributes(self):
         return {
-            "today_heating": round(self._today_heating, 2),
-            "last_update": self._last_update.isoformat(),
-            "last_state": self._last_state,
+            "today_heating": self._acc.hours,
+            **super().extra_state_attributes,
         }
 
-    def update(self):
-        now = datetime.datetime.now()
-        climate_state = self.hass.states.get(self._climate_entity_id)
-        hvac_action = STATE_UNKNOWN
-        if climate_state:
-            hvac_action = climate_state.attributes.get("hvac_action", STATE_UNKNOWN)
-
-        time_diff = (now - self._last_update).total_seconds() / 3600.0
-        if self._last_state == "heating":
-            self._today_heating += time_diff
-
-        # if new day => move today's total to "yesterday"
-        if now.date() != self._last_update.date():
-            self._state = self._today_heating
-            self._today_heating = 0.0
 
-        self._last_state = hvac_action
-        self._last_update = now
-
-
-class StatisticaCentralaLunaCurentaSensor(SensorEntity, RestoreEntity):
+class StatisticaCentralaLunaCurentaSensor(_MonthlyHeatingStatsSensor):
     """
     Tracks heating time for the current month.
     Resets at the start of each month.
     """
-    def __init__(self, climate_entity_id):
-        self._climate_entity_id = climate_entity_id
+    def __init__(self, coordinator, climate_entity_id):
+        super().__init__(coordinator)
         self._attr_name = "This Month Heater History"
         self._attr_unique_id = f"{climate_entity_id}_this_month_heater_history"
-        self._state = 0.0  # This month's total heating hours
-        self._monthly_heating = 0.0
-        self._last_update = datetime.datetime.now()
-        self._last_state = STATE_UNKNOWN
 
-    async def async_added_to_hass(self):
-        """Restore state on startup."""
-        await super().async_added_to_hass()
-        last_state = await self.async_get_last_state()
-        if last_state:
-            # restore to _monthly_heating
-            self._monthly_heating = float(last_state.state)
-            attributes = last_state.attributes
-            if "last_update" in attributes:
-                self._last_update = datetime.datetime.fromisoformat(attributes["last_update"])
-            if "last_state" in attributes:
-                self._last_state = attributes["last_state"]
-
-        # initialize _state to _monthly_heating on restore
-        self._state = self._monthly_heating
+    def _restore(self, last_state):
+        self._acc.seconds = _restored_seconds(last_state.state)
 
     @property
     def state(self):
-        return round(self._monthly_heating, 2)  # display _monthly_heating as state
-
-    @property
-    def extra_state_attributes(self):
-        return {
-            "last_update": self._last_update.isoformat(),
-            "last_state": self._last_state,
-        }
-
-    def update(self):
-        now = datetime.datetime.now()
-        climate_state = self.hass.states.get(self._climate_entity_id)
-        hvac_action = STATE_UNKNOWN
-        if climate_state:
-            hvac_action = climate_state.attributes.get("hvac_action", STATE_UNKNOWN)
+        return self._acc.hours
 
-        time_diff = (now - self._last_update).total_seconds() / 3600.0
-        if self._last_state == "heating":
-            self._monthly_heating += time_diff
 
-        # if new month => reset this month's heating
-        if now.month != self._last_update.month:
-            self._monthly_heating = 0.0
-
-        self._last_state = hvac_action
-        self._last_update = now
-
-
-class StatisticaCentralaLunaTrecutaSensor(SensorEntity, RestoreEntity):
+class StatisticaCentralaLunaTrecutaSensor(_MonthlyHeatingStatsSensor):
     """
     Tracks heating time for the last month.
     Updates at the start of each month.
     """
-    def __init__(self, climate_entity_id):
-        self._climate_entity_id = climate_entity_id
+    def __init__(self, coordinator, climate_entity_id):
+        super().__init__(coordinator)
         self._attr_name = "Last Month Heater History"
         self._attr_unique_id = f"{climate_entity_id}_last_month_heater_history"
-        self._state = 0.0  # Last month's total heating hours
-        self._this_month_heating = 0.0
-        self._last_update = datetime.datetime.now()
-        self._last_state = STATE_UNKNOWN
 
-    async def async_added_to_hass(self):
-        """Restore state on startup."""
-        await super().async_added_to_hass()
-        last_state = await self.async_get_last_state()
-        if last_state:
-            self._state = float(last_state.state)  # restore last month's history
-            attributes = last_state.attributes
-            if "this_month_heating" in attributes:
-                self._this_month_heating = float(attributes["this_month_heating"])
-            if "last_update" in attributes:
-                self._last_update = datetime.datetime.fromisoformat(attributes["last_update"])
-            if "last_state" in attributes:
-                self._last_state = attributes["last_state"]
+    def _restore(self, last_state):
+        self._acc.previous_seconds = _restored_seconds(last_state.state)  # last month's history
+        if "this_month_heating" in last_state.attributes:
+            self._acc.seconds = _restored_seconds(last_state.attributes["this_month_heating"])
 
     @property
     def state(self):
-        return round(self._state, 2)  # display last month's history
+        return self._acc.previous_hours  # display last month's history
 
     @property
     def extra_state_attributes(self):
         return {
-            "this_month_heating": round(self._this_month_heating, 2),
-            "last_update": self._last_update.isoformat(),
-            "last_state": self._last_state,
+            "this_month_heating": self._acc.hours,
+            **super().extra_state_attributes,
         }
 
-    def update(self):
-        now = datetime.datetime.now()
-        climate_state = self.hass.states.get(self._climate_entity_id)
-        hvac_action = STATE_UNKNOWN
-        if climate_state:
-            hvac_action = climate_state.attributes.get("hvac_action", STATE_UNKNOWN)
-
-        time_diff = (now - self._last_update).total_seconds() / 3600.0
-        if self._last_state == "heating":
-            self._this_month_heating += time_diff
-
-        # if new month => move this month's total to "last month"
-        if now.month != self._last_update.month:
-            self._state = self._this_month_heating  # current month becomes last month
-            self._this_month_heating = 0.0          # reset current month counter
-
-        self._last_state = hvac_action
-        self._last_update = now
-
 
 class DurataIncalzireSensor(SensorEntity):
     """
@@ -328,39 +372,26 @@ class DurataIncalzireSensor(SensorEntity):
         start: midnight
         end: now
 
-    We look at sensor.stare_termostat to see if it's "heating".
+    Same daily total as StatisticaCentralaSensor, kept under its own
+    entity for existing dashboards. It has no accumulator of its own and
+    just mirrors the Heater History total whenever that one is written.
     """
-    def __init__(self, stare_termostat_entity_id):
-        self._stare_termostat_entity_id = stare_termostat_entity_id
+    _attr_should_poll = False
+
+    def __init__(self, heater_history, stare_termostat_entity_id):
+        self._source = heater_history
         self._attr_name = "Heating Time"
         self._attr_unique_id = f"{stare_termostat_entity_id}_heating_time"
-        self._hours_heating = 0.0
-        self._last_update = datetime.datetime.now()
-        self._last_state = STATE_UNKNOWN
+
+    async def async_added_to_hass(self):
+        self._source._mirrors.append(self)
+        self.async_on_remove(lambda: self._source._mirrors.remove(self))
+        # totals kept here before this entity became a mirror
+        self._source.coordinator.stats.pop(self.unique_id, None)
 
     @property
     def state(self):
-        return round(self._hours_heating, 2)
-
-    def update(self):
-        now = datetime.datetime.now()
-        stare_state = self.hass.states.get(self._stare_termostat_entity_id)
-        if stare_state:
-            hvac_action = stare_state.state  # i.e. "heating" or "idle"
-        else:
-            hvac_action = STATE_UNKNOWN
-
-        # Reset if new day
-        if now.date() != self._last_update.date():
-            self._hours_heating = 0.0
-
-        # If last state was "heating," accumulate
-        time_diff = (now - self._last_update).total_seconds() / 3600.0
-        if self._last_state == "heating":
-            self._hours_heating += time_diff
-
-        self._last_state = hvac_action
-        self._last_update = now
+        return self._source._acc.hours
 
 
 # --------------------------------------------------------------------------
@@ -374,31 +405,19 @@ from homeassistant.const import (
     UnitOfTemperature,
 )
 
-class SalusCurrentTempSensor(SensorEntity):
+class SalusCurrentTempSensor(CoordinatorEntity, SensorEntity):
     """Sensor to expose the current temperature from the Salus climate entity."""
 
-    def __init__(self, climate_entity_id: str):
-        self._climate_entity_id = climate_entity_id
+    def __init__(self, coordinator, climate_entity_id: str):
+        super().__init__(coordinator)
         self._attr_name = "Salus Current Temperature"
         self._attr_unique_id = f"{climate_entity_id}_current_temperature"
         # Provide device_class & state_class for improved UI
         self._attr_device_class = SensorDeviceClass.TEMPERATURE
         self._attr_state_class = SensorStateClass.MEASUREMENT
         self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-        self._state = STATE_UNKNOWN
 
     @property
     def native_value(self):
-        """Return the current temperature as a float or Unknown/Unavailable."""
-        return self._state
-
-    def update(self):
-        """Fetch the current temperature from the Salus climate entity."""
-        climate_state = self.hass.states.get(self._climate_entity_id)
-        if not climate_state:
-            self._state = STATE_UNAVAILABLE
-            return
-
-        # The climate entity's 'current_temperature' attribute is the key
-        temperature = climate_state.attributes.get("current_temperature", STATE_UNKNOWN)
-        self._state = temperature
+        """Return the current temperature reported by Salus."""
+        return self.coordinator.data["current_temperature"]